@@ -5,31 +5,104 @@ Supabase数据库管理器
 处理news_items表的所有操作
 """
 
+import asyncio
 import json
-import uuid
+import sys
 from datetime import datetime, timezone
+from itertools import islice
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
 from typing import List, Dict, Optional, Set, Tuple
+import httpx
 from supabase import create_client, Client
+from supabase.lib.client_options import ClientOptions
+
+# 尝试使用orjson序列化（Rust实现，比标准库json快数倍），未安装则走supabase-py默认路径
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# numpy可选：超大批次查重时用C实现的isin代替Python级成员检查
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# 批次超过该阈值才走numpy向量化路径，摊销数组构建和导入成本
+_NUMPY_DEDUP_THRESHOLD = 2000
+
+# pybloom-live可选：百万级URL语料时用位压缩的布隆过滤器做前置判断，
+# "一定不存在"的URL无需探测大集合
+try:
+    from pybloom_live import BloomFilter
+except ImportError:
+    BloomFilter = None
+
+# psycopg可选：配置了pg_dsn时，超大批次直接走COPY二进制协议绕过PostgREST
+try:
+    import psycopg
+except ImportError:
+    psycopg = None
+
+# 批次超过该行数且有数据库直连时改用COPY写入
+_COPY_THRESHOLD = 500
+
+# 查重查询in.(...)过滤器的单次键数上限（过长的列表会撑爆PostgREST的URL长度限制）
+_IN_LIST_CHUNK = 500
 
 
 class SupabaseManager:
     """Supabase数据库管理器"""
-    
-    def __init__(self, url: str, key: str, table_name: str = "news_items"):
+
+    # _convert_time_to_iso在fromisoformat失败后依次尝试的时间格式
+    _TIME_FORMATS = (
+        '%Y-%m-%dT%H:%M:%S%z',
+        '%Y-%m-%d %H:%M:%S',
+        '%a, %d %b %Y %H:%M:%S %z',
+    )
+
+    # convert_to_supabase_format的默认字段值：类级元组进程内只分配一次，
+    # 每行再copy成list保证下游可以安全修改
+    _DEFAULT_COMPANIES: Tuple[str, ...] = ()
+    _DEFAULT_INDUSTRIES: Tuple[str, ...] = ()
+
+
+    def __init__(self, url: str, key: str, table_name: str = "news_items",
+                 batch_size: int = 500, max_concurrency: int = 4,
+                 pg_dsn: Optional[str] = None):
         """
         初始化Supabase连接
-        
+
         Args:
             url: Supabase项目URL
             key: Supabase服务密钥
             table_name: 表名，默认为news_items
+            batch_size: 批量插入时每个请求的最大行数
+            max_concurrency: 批量插入时并发请求数上限
+            pg_dsn: 可选的PostgreSQL直连DSN，配置后超大批次用COPY写入
         """
         self.url = url
         self.key = key
         self.table_name = table_name
+        self.batch_size = batch_size
+        self.max_concurrency = max_concurrency
+        self.pg_dsn = pg_dsn
         self.client: Optional[Client] = None
+        self._http: Optional[httpx.Client] = None
+        self._pg = None
+        self._bloom = None
+        self._bloom_capacity = 0
         self._connect()
-    
+
+    def _build_http_client(self) -> Optional[httpx.Client]:
+        """构建带连接池的httpx客户端，优先HTTP/2（h2未安装时退回HTTP/1.1）"""
+        limits = httpx.Limits(max_connections=10, max_keepalive_connections=10, keepalive_expiry=30)
+        try:
+            return httpx.Client(http2=True, limits=limits)
+        except ImportError:
+            # 缺少h2包，HTTP/1.1的keep-alive连接池依然有效
+            return httpx.Client(limits=limits)
+
     def _connect(self):
         """建立Supabase连接"""
         try:
@@ -39,21 +112,140 @@ class SupabaseManager:
             print(f"   - Key长度: {len(self.key) if self.key else 0}")
             print(f"   - Key前缀: {self.key[:10] if self.key else 'None'}...")
             print(f"   - 表名: {self.table_name}")
-            
-            self.client = create_client(self.url, self.key)
+
+            # 自建持久httpx客户端：TCP+TLS握手只做一次，后续请求复用连接
+            self._http = self._build_http_client()
+            try:
+                self.client = create_client(
+                    self.url, self.key, options=ClientOptions(httpx_client=self._http)
+                )
+            except TypeError:
+                # 旧版supabase-py的ClientOptions不支持httpx_client，退回默认连接方式
+                self._http.close()
+                self._http = None
+                self.client = create_client(self.url, self.key)
             print("✅ Supabase连接成功")
         except Exception as e:
             print(f"❌ Supabase连接失败: {e}")
             self.client = None
+
+    def close(self):
+        """关闭管理器持有的HTTP连接池和数据库直连"""
+        if self._http is not None:
+            try:
+                self._http.close()
+            except Exception:
+                pass
+            self._http = None
+        if self._pg is not None:
+            try:
+                self._pg.close()
+            except Exception:
+                pass
+            self._pg = None
+
+    def _get_pg_connection(self):
+        """惰性建立PostgreSQL直连；psycopg未安装或未配置DSN时返回None"""
+        if psycopg is None or not self.pg_dsn:
+            return None
+        if self._pg is None or self._pg.closed:
+            try:
+                self._pg = psycopg.connect(self.pg_dsn)
+            except Exception as e:
+                print(f"⚠️ PostgreSQL直连失败，使用REST插入: {e}")
+                self.pg_dsn = None
+                return None
+        return self._pg
+
+    def _insert_via_copy(self, articles: List[Dict], now_iso: str) -> int:
+        """
+        用COPY批量写入（同步，在线程池中执行）
+
+        先COPY进临时表，再INSERT ... ON CONFLICT (url) DO NOTHING合并到
+        目标表，保持与REST路径一致的去重语义；整批一个事务提交，
+        失败时自动回滚，连接保持可用以便下个批次继续走COPY
+
+        Args:
+            articles: 要插入的文章列表
+            now_iso: 本批次共用的当前时间ISO字符串
+
+        Returns:
+            int: 实际插入的行数
+        """
+        convert = self._make_row_converter(now_iso)
+        columns = ('title', 'url', 'published_at', 'created_at', 'content',
+                   'source', 'companies', 'industries', 'embedding_status')
+        column_list = ', '.join(columns)
+
+        pg = self._get_pg_connection()
+        # 事务块：成功时提交，任何一步抛错则回滚，原始异常原样抛给调用方
+        # 走REST回退；临时表用ON COMMIT DROP随事务自动清理，不依赖在失败
+        # 事务里还会再抛错的手动DROP
+        with pg.transaction():
+            with pg.cursor() as cursor:
+                cursor.execute(
+                    f"CREATE TEMP TABLE _copy_batch "
+                    f"(LIKE {self.table_name} INCLUDING DEFAULTS) ON COMMIT DROP"
+                )
+                with cursor.copy(f"COPY _copy_batch ({column_list}) FROM STDIN") as copy:
+                    for row in map(convert, articles):
+                        copy.write_row(tuple(row[column] for column in columns))
+                cursor.execute(
+                    f"INSERT INTO {self.table_name} ({column_list}) "
+                    f"SELECT {column_list} FROM _copy_batch "
+                    f"ON CONFLICT (url) DO NOTHING"
+                )
+                inserted = cursor.rowcount
+        return inserted
     
     def is_connected(self) -> bool:
         """检查是否已连接"""
         return self.client is not None
+
+    def ping(self) -> bool:
+        """轻量探活查询，验证缓存的连接仍然可用"""
+        if not self.client:
+            return False
+        try:
+            self.client.table(self.table_name).select("id").limit(1).execute()
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _normalize_url(url: str) -> str:
+        """
+        规范化URL用于查重比较
+
+        主机名转小写、去掉utm_*跟踪参数和fragment，让同一篇文章的
+        不同跳转形式也能命中查重
+
+        Args:
+            url: 原始URL
+
+        Returns:
+            str: 规范化后的URL
+        """
+        if not url:
+            return ''
+        try:
+            parts = urlsplit(url)
+            query = urlencode([
+                (key, value)
+                for key, value in parse_qsl(parts.query, keep_blank_values=True)
+                if not key.lower().startswith('utm_')
+            ])
+            return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path, query, ''))
+        except ValueError:
+            return url
     
     def get_existing_articles(self) -> Tuple[Set[str], Set[str]]:
         """
-        获取现有文章的URL和Title集合，用于查重
-        
+        获取现有文章的URL和Title集合（调试辅助）
+
+        爬取主流程已改用find_existing_keys做批次查重 + 数据库UNIQUE约束兜底，
+        这里保留用于本地调试和数据核对，全表拉取，谨慎在大表上调用
+
         Returns:
             Tuple[Set[str], Set[str]]: (existing_urls, existing_titles)
         """
@@ -63,27 +255,51 @@ class SupabaseManager:
         
         try:
             print("🔍 查询现有文章进行查重...")
-            
+
             # 尝试查询，处理可能的错误
             try:
-                # 只查询需要的字段以提高性能
-                result = self.client.table(self.table_name).select("url, title").execute()
-                
-                # 检查是否有数据返回
-                if hasattr(result, 'data') and result.data is not None:
-                    existing_urls = {item['url'] for item in result.data if item.get('url')}
-                    existing_titles = {item['title'] for item in result.data if item.get('title')}
-                    
-                    print(f"📊 数据库中现有文章: {len(result.data)} 篇")
+                # 分页拉取：PostgREST默认最多返回1000行，单次无range的查询会被
+                # 静默截断；按id排序保证翻页结果稳定。服务端max-rows可能比
+                # page_size小（返回的每页行数被压到上限），所以按实际返回的
+                # 行数推进offset，只有空页才说明取完了
+                page_size = 10000
+                offset = 0
+                total_rows = 0
+                existing_urls: Set[str] = set()
+                existing_titles: Set[str] = set()
+
+                while True:
+                    result = (
+                        self.client.table(self.table_name)
+                        .select("url, title")
+                        .order("id")
+                        .range(offset, offset + page_size - 1)
+                        .execute()
+                    )
+                    rows = result.data if hasattr(result, 'data') and result.data else []
+                    if not rows:
+                        break
+
+                    total_rows += len(rows)
+                    # intern合并重复字符串，规范化让比较两侧都是同一形式
+                    existing_urls.update(sys.intern(self._normalize_url(item['url']))
+                                         for item in rows if item.get('url'))
+                    existing_titles.update(sys.intern(item['title'])
+                                           for item in rows if item.get('title'))
+
+                    offset += len(rows)
+
+                if total_rows:
+                    print(f"📊 数据库中现有文章: {total_rows} 篇")
                     print(f"   - 现有URL: {len(existing_urls)} 个")
                     print(f"   - 现有标题: {len(existing_titles)} 个")
-                    
-                    return existing_urls, existing_titles
                 else:
                     # 如果没有数据或表为空
                     print("📊 数据库表为空或无数据")
-                    return set(), set()
-                    
+
+                self._maybe_build_bloom(existing_urls)
+                return existing_urls, existing_titles
+
             except Exception as query_error:
                 # 详细的错误调试信息
                 error_str = str(query_error)
@@ -114,6 +330,79 @@ class SupabaseManager:
             print(f"❌ 查询现有文章失败: {str(e)[:200]}")
             return set(), set()
     
+    def find_existing_keys(self, urls: List[str], titles: List[str]) -> Tuple[Set[str], Set[str]]:
+        """
+        按候选批次查询已存在的URL和Title，用于查重
+
+        与get_existing_articles不同，这里只向数据库传入本次爬取的候选键，
+        返回其中已存在的部分，网络传输量从O(表行数)降到O(批次命中数)
+
+        Args:
+            urls: 候选文章的URL列表
+            titles: 候选文章的标题列表
+
+        Returns:
+            Tuple[Set[str], Set[str]]: (existing_urls, existing_titles)
+        """
+        if not self.client:
+            print("⚠️ 数据库未连接，跳过查重")
+            return set(), set()
+
+        if not urls and not titles:
+            return set(), set()
+
+        try:
+            print(f"🔍 按批次查询重复文章（{len(urls)} 个URL, {len(titles)} 个标题）...")
+
+            existing_urls: Set[str] = set()
+            existing_titles: Set[str] = set()
+
+            # in.(...)过滤器按_IN_LIST_CHUNK分批，避免超长URL被PostgREST拒绝
+            for start in range(0, len(urls), _IN_LIST_CHUNK):
+                chunk = urls[start:start + _IN_LIST_CHUNK]
+                url_result = self.client.table(self.table_name).select("url").in_("url", chunk).execute()
+                if hasattr(url_result, 'data') and url_result.data:
+                    existing_urls.update(sys.intern(self._normalize_url(item['url']))
+                                         for item in url_result.data if item.get('url'))
+
+            for start in range(0, len(titles), _IN_LIST_CHUNK):
+                chunk = titles[start:start + _IN_LIST_CHUNK]
+                title_result = self.client.table(self.table_name).select("title").in_("title", chunk).execute()
+                if hasattr(title_result, 'data') and title_result.data:
+                    existing_titles.update(sys.intern(item['title'])
+                                           for item in title_result.data if item.get('title'))
+
+            print(f"📊 数据库命中: {len(existing_urls)} 个重复URL, {len(existing_titles)} 个重复标题")
+            return existing_urls, existing_titles
+
+        except Exception as e:
+            print(f"❌ 批次查重查询失败: {str(e)[:200]}")
+            return set(), set()
+
+    def _maybe_build_bloom(self, existing_urls: Set[str]):
+        """
+        用现有URL语料构建布隆过滤器（pybloom-live未安装时不做任何事）
+
+        过滤器按2倍当前语料量设容量；管理器被复用、语料增长超过容量的2/3
+        时重建，避免误判率失控
+
+        Args:
+            existing_urls: 规范化后的现有URL集合
+        """
+        if BloomFilter is None or not existing_urls:
+            return
+
+        if self._bloom is not None and len(existing_urls) * 1.5 <= self._bloom_capacity:
+            return
+
+        capacity = max(len(existing_urls) * 2, 1000)
+        bloom = BloomFilter(capacity=capacity, error_rate=1e-4)
+        for url in existing_urls:
+            bloom.add(url)
+        self._bloom = bloom
+        self._bloom_capacity = capacity
+        print(f"🧮 布隆过滤器已构建（容量 {capacity}）")
+
     def check_duplicates(self, articles: List[Dict], existing_urls: Set[str], existing_titles: Set[str]) -> List[Dict]:
         """
         检查重复文章（基于URL和Title）
@@ -126,138 +415,260 @@ class SupabaseManager:
         Returns:
             List[Dict]: 去重后的新文章列表
         """
+        # 空批次直接返回，不做任何查询或集合构建
+        if not articles:
+            return []
+
         print(f"🔍 开始查重检查...")
-        
-        new_articles = []
-        duplicate_count = 0
-        
-        for article in articles:
-            url = article.get('link', '')
-            title = article.get('title', '')
-            
-            # 检查URL和Title是否已存在
-            if url in existing_urls:
-                print(f"   ⚠️ 重复URL: {title[:50]}...")
-                duplicate_count += 1
-                continue
-            
-            if title in existing_titles:
-                print(f"   ⚠️ 重复标题: {title[:50]}...")
-                duplicate_count += 1
-                continue
-            
-            # 通过查重检查的新文章
-            new_articles.append(article)
-        
+
+        # URL先规范化，与find_existing_keys/get_existing_articles返回的集合保持同一形式
+        normalized_urls = [self._normalize_url(article.get('link', '')) for article in articles]
+        titles = [article.get('title', '') for article in articles]
+
+        if numpy is not None and len(articles) > _NUMPY_DEDUP_THRESHOLD:
+            # 超大批次：numpy.isin在C层完成成员检查，省掉Python级逐条哈希探测
+            url_array = numpy.fromiter(normalized_urls, dtype=object, count=len(articles))
+            title_array = numpy.fromiter(titles, dtype=object, count=len(articles))
+            keep_mask = (~numpy.isin(url_array, list(existing_urls))
+                         & ~numpy.isin(title_array, list(existing_titles)))
+            new_articles = [articles[i] for i in numpy.nonzero(keep_mask)[0]]
+            duplicate_samples = [titles[i] for i in numpy.nonzero(~keep_mask)[0][:5]]
+        else:
+            # 布隆过滤器判定"一定不存在"的URL直接当作新文章，
+            # 只有疑似命中的才落到精确集合比较
+            if self._bloom is not None:
+                bloom = self._bloom
+                candidate_urls = {url for url in normalized_urls if url in bloom}
+            else:
+                candidate_urls = set(normalized_urls)
+
+            # 集合交集一次性算出重复键，再单趟过滤，避免逐条成员检查和逐条打印
+            dup_urls = candidate_urls & existing_urls
+            dup_titles = set(titles) & existing_titles
+            new_articles = [
+                article for article, url, title in zip(articles, normalized_urls, titles)
+                if url not in dup_urls and title not in dup_titles
+            ]
+            duplicate_samples = [title for url, title in zip(normalized_urls, titles)
+                                 if url in dup_urls or title in dup_titles][:5]
+
+        duplicate_count = len(articles) - len(new_articles)
+
         print(f"📊 查重结果:")
         print(f"   - 原始文章: {len(articles)} 篇")
         print(f"   - 重复文章: {duplicate_count} 篇")
         print(f"   - 新文章: {len(new_articles)} 篇")
+
+        # 只展示有限样本，不逐条打印重复文章
+        if duplicate_count:
+            for title in duplicate_samples:
+                print(f"   ⚠️ 重复示例: {title[:50]}...")
+            if duplicate_count > len(duplicate_samples):
+                print(f"   ... 还有 {duplicate_count - len(duplicate_samples)} 篇重复文章")
         
         return new_articles
     
-    def convert_to_supabase_format(self, article: Dict) -> Dict:
+    def convert_to_supabase_format(self, article: Dict, now_iso: Optional[str] = None) -> Dict:
         """
         将爬虫数据格式转换为Supabase格式
-        
+
         Args:
             article: 爬虫文章数据
-            
+            now_iso: 当前时间的ISO字符串，批量转换时由调用方计算一次复用，
+                     避免每篇文章都做一次时钟调用和格式化
+
         Returns:
             Dict: Supabase格式的文章数据
         """
-        # 处理时间格式
-        published_at = self._convert_time_to_iso(article.get('full_time', ''))
-        
-        # 生成UUID作为主键
-        article_id = str(uuid.uuid4())
-        
-        return {
-            'id': article_id,
-            'title': article.get('title', ''),
-            'url': article.get('link', ''),
-            'published_at': published_at,
-            'created_at': datetime.now(timezone.utc).isoformat(),
-            'content': article.get('content', ''),
-            'source': article.get('source', 'Yahoo Finance'),
-            'companies': [],  # 待实现公司提取
-            'industries': [],  # 空数组
-            'embedding_status': 'pending',  # 待向量化
-            'embedding_vector_id': None,
-            'embedded_at': None,
-            'embedding_model': None
-        }
+        if now_iso is None:
+            now_iso = datetime.now(timezone.utc).isoformat()
+
+        # 字段布局在_make_row_converter中定义；主键id不再客户端生成，
+        # 由数据库DEFAULT gen_random_uuid()填充
+        return self._make_row_converter(now_iso)(article)
     
-    def _convert_time_to_iso(self, time_str: str) -> str:
+    def _make_row_converter(self, now_iso: str):
+        """
+        生成本批次专用的行转换闭包
+
+        把now_iso、默认值和方法引用预先绑定成闭包局部变量，批量转换时
+        每行只走LOAD_FAST，省掉逐行的self属性查找；字段布局与
+        convert_to_supabase_format保持一致
+
+        Args:
+            now_iso: 本批次共用的当前时间ISO字符串
+
+        Returns:
+            Callable[[Dict], Dict]: 单篇文章的转换函数
+        """
+        _get = dict.get
+        _convert_time = self._convert_time_to_iso
+        _companies = self._DEFAULT_COMPANIES
+        _industries = self._DEFAULT_INDUSTRIES
+
+        def _convert(article: Dict) -> Dict:
+            return {
+                'title': _get(article, 'title', ''),
+                'url': _get(article, 'link', ''),
+                'published_at': _convert_time(_get(article, 'full_time', ''), now_iso),
+                'created_at': now_iso,
+                'content': _get(article, 'content', ''),
+                'source': _get(article, 'source', 'Yahoo Finance'),
+                'companies': list(_companies),
+                'industries': list(_industries),
+                'embedding_status': 'pending',
+                'embedding_vector_id': None,
+                'embedded_at': None,
+                'embedding_model': None
+            }
+
+        return _convert
+
+    def _convert_time_to_iso(self, time_str: str, now_iso: Optional[str] = None) -> str:
         """
         将时间字符串转换为ISO格式
-        
+
         Args:
             time_str: 原始时间字符串
-            
+            now_iso: 无法解析时使用的当前时间ISO字符串，批量场景下复用调用方的值
+
         Returns:
             str: ISO格式的时间字符串
         """
+        if now_iso is None:
+            now_iso = datetime.now(timezone.utc).isoformat()
+
         if not time_str or time_str == 'Recent':
             # 如果没有具体时间，使用当前时间
-            return datetime.now(timezone.utc).isoformat()
-        
+            return now_iso
+
+        # 优先fromisoformat（C实现），覆盖Yahoo页面里最常见的ISO时间戳
         try:
-            # 尝试解析常见的时间格式
-            if 'T' in time_str and ('Z' in time_str or '+' in time_str):
-                # 已经是ISO格式
-                return time_str
-            
-            # 其他格式可以在这里添加解析逻辑
-            # 暂时使用当前时间
-            return datetime.now(timezone.utc).isoformat()
-            
-        except Exception as e:
-            print(f"⚠️ 时间格式转换失败 ({time_str}): {e}")
-            return datetime.now(timezone.utc).isoformat()
+            return datetime.fromisoformat(time_str.replace('Z', '+00:00')).isoformat()
+        except ValueError:
+            pass
+
+        # 再逐个尝试其他已知格式，保住真实发布时间而不是回退到当前时间
+        for time_format in self._TIME_FORMATS:
+            try:
+                return datetime.strptime(time_str, time_format).isoformat()
+            except ValueError:
+                continue
+
+        return now_iso
     
-    def insert_articles(self, articles: List[Dict]) -> bool:
+    def _insert_chunk(self, chunk: List[Dict]) -> List[Dict]:
+        """插入单个批次（同步，在线程池中执行），返回实际插入的行"""
+        if orjson is not None:
+            # 直接POST orjson序列化好的字节，绕过supabase-py内部的json.dumps
+            response = self.client.postgrest.session.post(
+                f"/{self.table_name}",
+                content=orjson.dumps(chunk),
+                params={'on_conflict': 'url'},
+                headers={
+                    'Content-Type': 'application/json',
+                    'Prefer': 'resolution=ignore-duplicates,return=representation',
+                },
+            )
+            response.raise_for_status()
+            return response.json() if response.content else []
+
+        result = self.client.table(self.table_name).upsert(
+            chunk, on_conflict='url', ignore_duplicates=True
+        ).execute()
+        return result.data or []
+
+    async def insert_articles(self, articles: List[Dict]) -> bool:
         """
         批量插入文章到数据库
-        
+
+        大批量拆分为batch_size大小的块并发提交（上限max_concurrency），
+        避免单个超大请求触发PostgREST的请求体限制，同时让网络传输和
+        服务端写入相互重叠
+
+        使用upsert(on_conflict='url')让数据库通过url上的UNIQUE约束兜底去重，
+        即使客户端查重漏掉（例如并发运行的两次爬取），也不会产生重复行
+
         Args:
             articles: 要插入的文章列表
-            
+
         Returns:
             bool: 是否插入成功
         """
         if not articles:
             print("📝 没有新文章需要插入")
             return True
-        
+
         if not self.client:
             print("❌ 数据库未连接，无法插入数据")
             return False
-        
+
         try:
             print(f"📝 开始插入 {len(articles)} 篇新文章到数据库...")
-            
-            # 转换数据格式
-            supabase_articles = [self.convert_to_supabase_format(article) for article in articles]
-            
-            # 批量插入
-            result = self.client.table(self.table_name).insert(supabase_articles).execute()
-            
-            if result.data:
-                print(f"✅ 成功插入 {len(result.data)} 篇文章到数据库")
-                
+
+            # created_at在整批内共用同一个时间戳
+            now_iso = datetime.now(timezone.utc).isoformat()
+
+            # 超大批次且配置了数据库直连时，COPY一次往返完成写入
+            if len(articles) > _COPY_THRESHOLD and self._get_pg_connection() is not None:
+                try:
+                    inserted = await asyncio.to_thread(self._insert_via_copy, articles, now_iso)
+                    print(f"✅ COPY批量写入 {inserted} 篇文章到数据库")
+                    return True
+                except Exception as copy_error:
+                    print(f"⚠️ COPY写入失败，退回REST批量插入: {copy_error}")
+
+            # 转换数据格式 - map+批次专用闭包惰性转换，避免整批转换结果同时驻留内存
+            row_iter = map(self._make_row_converter(now_iso), articles)
+
+            if len(articles) > self.batch_size:
+                print(f"📦 按每批最多 {self.batch_size} 行拆分，{self.max_concurrency} 并发提交")
+
+            # 工作协程从共享生成器取批次，同时驻留内存的转换结果最多
+            # max_concurrency * batch_size 行；supabase-py底层是同步httpx，放进线程池执行
+            inserted_rows: List[Dict] = []
+            failed_chunks = 0
+
+            def _next_chunk() -> List[Dict]:
+                # 预分配批次缓冲区再裁剪：islice没有长度提示，直接list()会经历
+                # 多次倍增扩容，满批次场景下这里一次分配到位
+                chunk: List[Dict] = [None] * self.batch_size
+                count = 0
+                for row in islice(row_iter, self.batch_size):
+                    chunk[count] = row
+                    count += 1
+                del chunk[count:]
+                return chunk
+
+            async def _worker():
+                nonlocal failed_chunks
+                while True:
+                    chunk = _next_chunk()
+                    if not chunk:
+                        return
+                    try:
+                        inserted_rows.extend(await asyncio.to_thread(self._insert_chunk, chunk))
+                    except Exception as chunk_error:
+                        print(f"❌ 批次插入失败: {chunk_error}")
+                        failed_chunks += 1
+
+            await asyncio.gather(*[_worker() for _ in range(self.max_concurrency)])
+
+            if inserted_rows:
+                print(f"✅ 成功插入 {len(inserted_rows)} 篇文章到数据库")
+
                 # 显示插入的文章标题
-                for i, article in enumerate(result.data[:5], 1):
+                for i, article in enumerate(inserted_rows[:5], 1):
                     print(f"   {i}. {article['title'][:50]}...")
-                
-                if len(result.data) > 5:
-                    print(f"   ... 还有 {len(result.data) - 5} 篇文章")
-                
-                return True
+
+                if len(inserted_rows) > 5:
+                    print(f"   ... 还有 {len(inserted_rows) - 5} 篇文章")
+
+                return failed_chunks == 0
             else:
                 print("⚠️ 插入结果为空")
                 return False
-                
+
         except Exception as e:
             print(f"❌ 插入文章失败: {e}")
             return False
@@ -273,17 +684,33 @@ class SupabaseManager:
             return {"error": "数据库未连接"}
         
         try:
-            # 获取总数 - 通过获取所有记录来计数
-            result = self.client.table(self.table_name).select("id").execute()
-            total_count = len(result.data) if result.data else 0
-            
-            # 获取来源统计
-            source_result = self.client.table(self.table_name).select("source").execute()
+            # 获取总数 - head=True只返回计数响应头，不传输任何行
+            count_result = self.client.table(self.table_name).select(
+                "*", count="exact", head=True
+            ).execute()
+            total_count = count_result.count or 0
+
+            # 获取来源统计 - 优先读预聚合的物化视图（news_items_source_counts，
+            # 见README，定时REFRESH），其次是实时聚合RPC（source_counts），
+            # 都不存在时才退回拉取source列在客户端统计
             sources = {}
-            for item in source_result.data:
-                source = item.get('source', 'Unknown')
-                sources[source] = sources.get(source, 0) + 1
-            
+            try:
+                view_result = self.client.table('news_items_source_counts').select('source,n').execute()
+                if not view_result.data:
+                    raise ValueError("物化视图为空")
+                for item in view_result.data:
+                    sources[item.get('source') or 'Unknown'] = item.get('n', 0)
+            except Exception:
+                try:
+                    rpc_result = self.client.rpc('source_counts').execute()
+                    for item in rpc_result.data or []:
+                        sources[item.get('source') or 'Unknown'] = item.get('count', 0)
+                except Exception:
+                    source_result = self.client.table(self.table_name).select("source").execute()
+                    for item in source_result.data or []:
+                        source = item.get('source', 'Unknown')
+                        sources[source] = sources.get(source, 0) + 1
+
             return {
                 "total_articles": total_count,
                 "sources": sources,
@@ -294,24 +721,41 @@ class SupabaseManager:
             return {"error": f"获取统计信息失败: {e}"}
 
 
+# 按(url, table_name)缓存的管理器实例：同一进程内多次创建时复用连接，
+# 省掉重复的TLS握手和PostgREST发现请求
+_MANAGER_CACHE: Dict[Tuple[str, str], SupabaseManager] = {}
+
+
 def create_supabase_manager(config: Dict) -> Optional[SupabaseManager]:
     """
-    创建Supabase管理器实例
-    
+    创建（或复用）Supabase管理器实例
+
     Args:
         config: Supabase配置字典
-        
+
     Returns:
         SupabaseManager: 管理器实例，连接失败时返回None
     """
     try:
+        cache_key = (config['url'], config.get('table_name', 'news_items'))
+        cached = _MANAGER_CACHE.get(cache_key)
+        if cached is not None and cached.is_connected() and cached.ping():
+            print("♻️ 复用已有的Supabase管理器")
+            return cached
+
         manager = SupabaseManager(
             url=config['url'],
             key=config['anon_key'],
-            table_name=config.get('table_name', 'news_items')
+            table_name=config.get('table_name', 'news_items'),
+            batch_size=config.get('batch_size', 500),
+            max_concurrency=config.get('max_concurrency', 4),
+            pg_dsn=config.get('pg_dsn')
         )
-        return manager if manager.is_connected() else None
-        
+        if manager.is_connected():
+            _MANAGER_CACHE[cache_key] = manager
+            return manager
+        return None
+
     except Exception as e:
         print(f"❌ 创建Supabase管理器失败: {e}")
         return None
\ No newline at end of file
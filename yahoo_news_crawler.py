@@ -12,16 +12,46 @@ import csv
 import re
 import os
 import random
+from html import unescape
+from types import MappingProxyType
 from datetime import datetime, timedelta
 from urllib.parse import urljoin, urlparse
 from asyncio import Semaphore
 
 # Web scraping
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from bs4 import BeautifulSoup
 
+# selectolax可选（Modest引擎的C解析器，在大页面上比lxml快数倍），
+# 未安装时自动退回BeautifulSoup
+try:
+    from selectolax.parser import HTMLParser
+except ImportError:
+    HTMLParser = None
+
+# orjson可选（Rust实现的JSON编码，比标准库快数倍），未安装退回标准库json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# brotli解码能力探测：requests只有装了brotli/brotlicffi才能解码br响应，
+# 否则不能在Accept-Encoding里声明br，不然拿到的是解不开的压缩字节，
+# 解析器只会"静默"地提取出空内容
+try:
+    import brotli  # noqa: F401
+    _BROTLI_OK = True
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+        _BROTLI_OK = True
+    except ImportError:
+        _BROTLI_OK = False
+
 # Crawl4AI
-from crawl4ai import AsyncWebCrawler, BrowserConfig, CrawlerRunConfig, CacheMode, VirtualScrollConfig
+from crawl4ai import AsyncWebCrawler, BrowserConfig, CrawlerRunConfig, CacheMode
 
 # Supabase
 from supabase_manager import SupabaseManager, create_supabase_manager
@@ -35,6 +65,52 @@ except ImportError:
     pass
 
 
+# 预编译的正则和选择器 - 热路径上不必每次调用重新编译/拼装
+_STREAM_ITEM_RE = re.compile(r'stream|item')
+# 列表页链接的字节级正则 - 直接在原始字节上扫(aria-label, href)对，免去整树构建
+_LISTING_ANCHOR_RE = re.compile(rb'<a[^>]*?aria-label="([^"]+)"[^>]*?href="([^"]+)"', re.I)
+# 时间文本分类：一次search代替一连串子串扫描（分钟/小时/刚刚三类）
+_TIME_CLASSIFIER = re.compile(
+    r'(?P<mins>minute|分钟)'
+    r'|(?P<hours>(?P<h>\d+)\s*(?:hour|小时)|an?\s+hour)'
+    r'|(?P<now>just now|刚刚|刚才|^now$)'
+)
+_YF_CLASS_RE = re.compile(r'\byf-')
+_MAIN_CONTENT_SELECTOR = 'div[data-testid="caas-body"], .caas-body, div.caas-body, div[class*="body"]'
+_TIME_SELECTOR = ('time[datetime], [data-testid="timestamp"], '
+                  'div[data-testid="caas-attr-time-style"], .caas-attr-time-style')
+
+# 单篇文章内容的累计长度上限 - 超长文章提前停止收集段落
+_MAX_CONTENT_CHARS = 50_000
+
+# 列表页HTML缓存的存活时间（秒）- 回退重试在窗口内直接重新解析，不再重新抓取
+_LISTING_CACHE_TTL = 300
+
+# lxml的预编译CSS选择器可选（cssselect把CSS一次性编译成XPath，之后每篇文章
+# 都以C速度求值），未安装cssselect时退回BeautifulSoup
+try:
+    from lxml import html as lxml_html
+    from lxml.cssselect import CSSSelector
+    _LXML_MAIN_SEL = CSSSelector(_MAIN_CONTENT_SELECTOR)
+    _LXML_TIME_SEL = CSSSelector(_TIME_SELECTOR)
+    _LXML_P_SEL = CSSSelector('p')
+    _LXML_READ_MORE_SEL = CSSSelector('div.read-more-wrapper')
+except ImportError:
+    lxml_html = None
+
+
+def _is_strict_story_class(class_attr):
+    """BS4严格匹配：stream-item且story-item且非广告"""
+    class_str = str(class_attr)
+    return bool(class_attr) and 'stream-item' in class_str and 'story-item' in class_str and 'ad-item' not in class_str
+
+
+def _is_loose_item_class(class_attr):
+    """BS4宽松匹配：item且非广告"""
+    class_str = str(class_attr)
+    return bool(class_attr) and 'item' in class_str and 'ad' not in class_str
+
+
 class AntiDetection:
     """反反爬虫工具类"""
     
@@ -47,20 +123,25 @@ class AntiDetection:
         'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
     ]
     
+    # 固定不变的9个请求头 - 只读映射，各处直接复用，避免每次请求重建整个dict
+    BASE_HEADERS = MappingProxyType({
+        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,image/apng,*/*;q=0.8',
+        'Accept-Language': 'en-US,en;q=0.9,zh-CN;q=0.8,zh;q=0.7',
+        'Accept-Encoding': 'gzip, deflate, br' if _BROTLI_OK else 'gzip, deflate',
+        'Connection': 'keep-alive',
+        'Upgrade-Insecure-Requests': '1',
+        'Sec-Fetch-Dest': 'document',
+        'Sec-Fetch-Mode': 'navigate',
+        'Sec-Fetch-Site': 'none',
+        'Cache-Control': 'max-age=0'
+    })
+
     @staticmethod
     def get_random_headers():
         """获取随机请求头"""
         return {
-            'User-Agent': random.choice(AntiDetection.USER_AGENTS),
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,image/apng,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.9,zh-CN;q=0.8,zh;q=0.7',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-            'Sec-Fetch-Dest': 'document',
-            'Sec-Fetch-Mode': 'navigate',
-            'Sec-Fetch-Site': 'none',
-            'Cache-Control': 'max-age=0'
+            **AntiDetection.BASE_HEADERS,
+            'User-Agent': random.choice(AntiDetection.USER_AGENTS)
         }
     
     @staticmethod
@@ -75,13 +156,47 @@ class YahooNewsCrawl4AICrawler:
     
     def __init__(self, supabase_config=None):
         self.articles = []
+        # 已见链接/标题索引：去重用O(1)集合成员检查代替遍历self.articles
+        self._seen_links = set()
+        self._seen_titles = set()
         self.urls = [
             "https://finance.yahoo.com/topic/latest-news/",
             "https://finance.yahoo.com/news/", 
             "https://finance.yahoo.com/topic/tech/"
         ]
         self.is_ci_environment = self._detect_ci_environment()
-        
+        # 调试开关：打开后输出页面结构探查信息（生产环境默认关闭，省掉整页DOM遍历）
+        self._debug = os.getenv('YAHOO_CRAWLER_DEBUG', '').lower() in ('1', 'true', 'yes')
+
+        # 进程级并发上限：抓取信号量在主路径和备用路径间共享，
+        # 重试/回退不会把对Yahoo的并发请求数翻倍
+        self._fetch_sem = Semaphore(3 if self.is_ci_environment else 5)
+        # 浏览器信号量：任一时刻最多一个headless Chromium实例在滚动
+        self._browser_sem = Semaphore(1)
+        # 惰性创建、整个爬虫生命周期内复用的Crawl4AI浏览器实例，
+        # 重试/回退不必再付一次Chromium冷启动（约2秒）
+        self._crawler_cm = None
+        self._crawler = None
+
+        # 列表页HTML缓存：url -> (抓取时间戳, html)。
+        # 主路径抓到页面但解析出0篇时，回退路径直接复用缓存重新解析
+        self._listing_html_cache = {}
+
+        # 共享HTTP会话：同一主机的请求复用TCP+TLS连接，省掉每次握手；
+        # 429/502/503/504按指数退避重试，尊重服务端的Retry-After
+        retry_policy = Retry(
+            total=4,
+            status_forcelist=[429, 502, 503, 504],
+            backoff_factor=0.5,
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        self.session = requests.Session()
+        self.session.mount('https://', HTTPAdapter(
+            pool_connections=10, pool_maxsize=20, max_retries=retry_policy
+        ))
+        self.session.headers.update(AntiDetection.BASE_HEADERS)
+
         # 初始化Supabase管理器
         self.supabase_manager = None
         if supabase_config:
@@ -101,52 +216,90 @@ class YahooNewsCrawl4AICrawler:
             'JENKINS_URL'
         ]
         return any(os.getenv(indicator) for indicator in ci_indicators)
-        
+
+    async def _get_crawler(self):
+        """获取共享的AsyncWebCrawler实例 - 首次调用时启动浏览器，之后复用"""
+        if self._crawler is None:
+            self._crawler_cm = AsyncWebCrawler(config=self._build_browser_config())
+            self._crawler = await self._crawler_cm.__aenter__()
+        return self._crawler
+
+    async def aclose(self):
+        """释放爬虫持有的网络资源（浏览器实例只关闭一次）"""
+        if self._crawler_cm is not None:
+            try:
+                await self._crawler_cm.__aexit__(None, None, None)
+            except Exception as e:
+                print(f"⚠️ 关闭浏览器实例出错: {e}")
+            finally:
+                self._crawler_cm = None
+                self._crawler = None
+        try:
+            self.session.close()
+        except Exception:
+            pass
+
+
     def is_within_hours(self, time_text, max_hours=2):
         """检查时间是否在指定小时内"""
         if not time_text:
             return True
         
         time_text = str(time_text).lower().strip()
-        
-        # 匹配"X分钟前" 或 "X minutes ago"
-        if 'minute' in time_text or '分钟' in time_text:
+
+        # 一次正则search同时识别"X分钟前"/"X小时前"/"刚刚"等形式
+        match = _TIME_CLASSIFIER.search(time_text)
+        if not match:
+            # 如果无法解析，默认包含（假设是最新的）
             return True
-        
-        # 匹配"X小时前" 或 "X hours ago"  
-        if 'hour' in time_text or '小时' in time_text:
-            hours_match = re.search(r'(\d+)', time_text)
-            if hours_match:
-                hours = int(hours_match.group(1))
-                return hours <= max_hours
-            return True  # "an hour ago" 或 "1小时前"
-        
-        # 匹配"刚刚"、"just now"等
-        if any(word in time_text for word in ['just now', 'now', '刚刚', '刚才']):
+
+        # 分钟级或"刚刚"直接通过
+        if match.group('mins') or match.group('now'):
             return True
-            
-        # 如果无法解析，默认包含（假设是最新的）
+
+        # 小时级：有数字则比较，"an hour ago"等无数字形式视为1小时内
+        hours_digits = match.group('h')
+        if hours_digits:
+            return int(hours_digits) <= max_hours
         return True
     
+    def _fetch_and_parse(self, article_url, headers, timeout):
+        """在线程池内完成请求+解析 - 解析是CPU密集操作，留在事件循环上会阻塞其他协程"""
+        # 发起请求 - 复用会话连接池
+        response = self.session.get(article_url, headers=headers, timeout=timeout)
+
+        # 连接层重试耗尽仍拿到429时，按Retry-After加抖动再试最后一次
+        # （本方法整体运行在工作线程里，阻塞sleep不会影响事件循环）
+        if response.status_code == 429:
+            retry_after = response.headers.get('Retry-After')
+            try:
+                wait_seconds = float(retry_after)
+            except (TypeError, ValueError):
+                wait_seconds = 2.0
+            time.sleep(wait_seconds + random.uniform(0, 0.5))
+            response = self.session.get(article_url, headers=headers, timeout=timeout)
+
+        response.raise_for_status()
+        return self._extract_article_details(response.text, article_url)
+
     async def get_article_content(self, article_url):
         """获取文章的完整内容和准确时间 - 使用requests替代Crawl4AI"""
         try:
-            # 随机延迟，避免请求过于频繁
-            await AntiDetection.random_delay(0.5, 2.0)
-            
-            # 使用随机请求头
-            headers = AntiDetection.get_random_headers()
-            
-            # 设置会话
+            # 小幅随机延迟错开请求节奏；限流时靠退避重试，
+            # 不再用长的固定延迟惩罚健康响应
+            await AntiDetection.random_delay(0.2, 0.5)
+
+            # 基础请求头已设置在会话上，每次只随机化User-Agent
+            headers = {'User-Agent': random.choice(AntiDetection.USER_AGENTS)}
+
             timeout = 15 if self.is_ci_environment else 10
-            
-            # 发起请求
-            response = requests.get(article_url, headers=headers, timeout=timeout)
-            response.raise_for_status()
-            
-            # 解析内容
-            return self._extract_article_details(response.text, article_url)
-            
+
+            # 请求和解析一并放进线程池 - 解析器构建DOM时会释放GIL，
+            # 既不阻塞事件循环，也减少一半协程调度开销
+            return await asyncio.to_thread(
+                self._fetch_and_parse, article_url, headers, timeout
+            )
+
         except requests.exceptions.Timeout:
             print(f"⚠️ 请求超时: {article_url}")
             return {"content": "", "full_time": ""}
@@ -158,238 +311,435 @@ class YahooNewsCrawl4AICrawler:
             return {"content": "", "full_time": ""}
     
     def _extract_article_details(self, html_content, article_url):
-        """从文章页面HTML中提取内容和时间"""
+        """从文章页面HTML中提取内容和时间 - selectolax → lxml → BeautifulSoup逐级退回"""
         try:
-            soup = BeautifulSoup(html_content, 'lxml')
-            
-            # 提取文章内容
-            content_parts = []
-            
-            # 1. 获取主要内容区域
-            main_content_selectors = [
-                'div[data-testid="caas-body"]',
-                '.caas-body',
-                'div.caas-body',
-                'div[class*="body"]'
-            ]
-            
-            main_content = None
-            for selector in main_content_selectors:
-                main_content = soup.select_one(selector)
-                if main_content:
-                    break
-            
-            if main_content:
-                # 2. 获取可见的段落内容
-                visible_paragraphs = main_content.find_all('p', class_=lambda x: x and 'yf-' in str(x))
-                for p in visible_paragraphs:
-                    text = p.get_text(strip=True)
-                    if text and len(text) > 10:  # 过滤太短的段落
-                        content_parts.append(text)
-                
-                # 3. 获取隐藏的read-more内容
+            if HTMLParser is not None:
+                try:
+                    return self._extract_article_details_selectolax(html_content)
+                except Exception as e:
+                    print(f"⚠️ selectolax解析失败，退回lxml: {e}")
+
+            if lxml_html is not None:
+                try:
+                    return self._extract_article_details_lxml(html_content)
+                except Exception as e:
+                    print(f"⚠️ lxml解析失败，退回BeautifulSoup: {e}")
+
+            return self._extract_article_details_bs4(html_content)
+
+        except Exception as e:
+            print(f"⚠️ 解析文章详情出错 {article_url}: {e}")
+            return {"content": "", "full_time": ""}
+
+    def _extract_article_details_selectolax(self, html_content):
+        """selectolax实现的文章详情提取"""
+        tree = HTMLParser(html_content)
+
+        # 提取文章内容
+        content_parts = []
+
+        # 1. 获取主要内容区域 - 逗号选择器一次覆盖所有候选
+        main_content = tree.css_first(_MAIN_CONTENT_SELECTOR)
+
+        if main_content:
+            # 2. 获取可见的段落内容 - 累计长度超过上限即提前停止
+            total_len = 0
+            for p in main_content.css('p'):
+                if not _YF_CLASS_RE.search(p.attributes.get('class') or ''):
+                    continue
+                text = p.text(strip=True)
+                if text and len(text) > 10:  # 过滤太短的段落
+                    content_parts.append(text)
+                    total_len += len(text)
+                    if total_len > _MAX_CONTENT_CHARS:
+                        break
+
+            # 3. 获取隐藏的read-more内容
+            if total_len <= _MAX_CONTENT_CHARS:
+                read_more_wrapper = main_content.css_first('div.read-more-wrapper')
+                if read_more_wrapper:
+                    for p in read_more_wrapper.css('p'):
+                        text = p.text(strip=True)
+                        if text and len(text) > 10 and 'Read the original article' not in text:
+                            content_parts.append(text)
+                            total_len += len(text)
+                            if total_len > _MAX_CONTENT_CHARS:
+                                break
+
+        # 提取准确的发布时间
+        full_time = ""
+        time_element = tree.css_first(_TIME_SELECTOR)
+        if time_element:
+            full_time = time_element.attributes.get('datetime') or time_element.text(strip=True)
+
+        # 组合完整内容
+        full_content = '\n\n'.join(content_parts) if content_parts else ""
+
+        return {
+            "content": full_content,
+            "full_time": full_time or "Recent"
+        }
+
+    def _extract_article_details_lxml(self, html_content):
+        """lxml实现的文章详情提取 - CSS选择器已在模块加载时编译为XPath"""
+        root = lxml_html.fromstring(html_content)
+
+        # 提取文章内容
+        content_parts = []
+
+        # 1. 获取主要内容区域
+        main_candidates = _LXML_MAIN_SEL(root)
+        main_content = main_candidates[0] if main_candidates else None
+
+        if main_content is not None:
+            # 2. 获取可见的段落内容 - 累计长度超过上限即提前停止
+            total_len = 0
+            for p in _LXML_P_SEL(main_content):
+                if not _YF_CLASS_RE.search(p.get('class') or ''):
+                    continue
+                text = p.text_content().strip()
+                if text and len(text) > 10:  # 过滤太短的段落
+                    content_parts.append(text)
+                    total_len += len(text)
+                    if total_len > _MAX_CONTENT_CHARS:
+                        break
+
+            # 3. 获取隐藏的read-more内容
+            if total_len <= _MAX_CONTENT_CHARS:
+                read_more_wrappers = _LXML_READ_MORE_SEL(main_content)
+                if read_more_wrappers:
+                    for p in _LXML_P_SEL(read_more_wrappers[0]):
+                        text = p.text_content().strip()
+                        if text and len(text) > 10 and 'Read the original article' not in text:
+                            content_parts.append(text)
+                            total_len += len(text)
+                            if total_len > _MAX_CONTENT_CHARS:
+                                break
+
+        # 提取准确的发布时间
+        full_time = ""
+        time_nodes = _LXML_TIME_SEL(root)
+        if time_nodes:
+            full_time = time_nodes[0].get('datetime') or time_nodes[0].text_content().strip()
+
+        # 组合完整内容
+        full_content = '\n\n'.join(content_parts) if content_parts else ""
+
+        return {
+            "content": full_content,
+            "full_time": full_time or "Recent"
+        }
+
+    def _extract_article_details_bs4(self, html_content):
+        """BeautifulSoup实现的文章详情提取（selectolax和lxml都不可用时的备用路径）"""
+        soup = BeautifulSoup(html_content, 'lxml')
+
+        # 提取文章内容
+        content_parts = []
+
+        # 1. 获取主要内容区域 - 逗号选择器一次覆盖所有候选
+        main_content = soup.select_one(_MAIN_CONTENT_SELECTOR)
+
+        if main_content:
+            # 2. 获取可见的段落内容 - 累计长度超过上限即提前停止
+            total_len = 0
+            for p in main_content.find_all('p', class_=_YF_CLASS_RE):
+                text = p.get_text(strip=True)
+                if text and len(text) > 10:  # 过滤太短的段落
+                    content_parts.append(text)
+                    total_len += len(text)
+                    if total_len > _MAX_CONTENT_CHARS:
+                        break
+
+            # 3. 获取隐藏的read-more内容
+            if total_len <= _MAX_CONTENT_CHARS:
                 read_more_wrapper = main_content.find('div', class_='read-more-wrapper')
                 if read_more_wrapper:
-                    hidden_paragraphs = read_more_wrapper.find_all('p')
-                    for p in hidden_paragraphs:
+                    for p in read_more_wrapper.find_all('p'):
                         # 获取HTML_TAG_START到HTML_TAG_END之间的内容
                         text = p.get_text(strip=True)
                         if text and len(text) > 10 and 'Read the original article' not in text:
                             content_parts.append(text)
-            
-            # 提取准确的发布时间
-            full_time = ""
-            time_selectors = [
-                'time[datetime]',
-                '[data-testid="timestamp"]',
-                'div[data-testid="caas-attr-time-style"]',
-                '.caas-attr-time-style'
-            ]
-            
-            for selector in time_selectors:
-                time_element = soup.select_one(selector)
-                if time_element:
-                    full_time = time_element.get('datetime') or time_element.get_text(strip=True)
-                    if full_time:
-                        break
-            
-            # 组合完整内容
-            full_content = '\n\n'.join(content_parts) if content_parts else ""
-            
-            return {
-                "content": full_content,
-                "full_time": full_time or "Recent"
-            }
-            
-        except Exception as e:
-            print(f"⚠️ 解析文章详情出错 {article_url}: {e}")
-            return {"content": "", "full_time": ""}
+                            total_len += len(text)
+                            if total_len > _MAX_CONTENT_CHARS:
+                                break
+
+        # 提取准确的发布时间
+        full_time = ""
+        time_element = soup.select_one(_TIME_SELECTOR)
+        if time_element:
+            full_time = time_element.get('datetime') or time_element.get_text(strip=True)
+
+        # 组合完整内容
+        full_content = '\n\n'.join(content_parts) if content_parts else ""
+
+        return {
+            "content": full_content,
+            "full_time": full_time or "Recent"
+        }
     
     
+    def _append_listing_article(self, title, link):
+        """
+        规范化并登记一条列表页新闻
+
+        Returns:
+            bool: 是否登记成功（标题/链接无效或重复时返回False）
+        """
+        if not title or len(title) < 10:
+            return False
+
+        if not link:
+            return False
+
+        # 处理相对链接
+        if link.startswith('/'):
+            link = f"https://finance.yahoo.com{link}"
+        elif not link.startswith('http'):
+            return False
+
+        # 去重检查 - 基于title和link
+        if link in self._seen_links or title in self._seen_titles:
+            return False
+
+        self._seen_links.add(link)
+        self._seen_titles.add(title)
+        self.articles.append({
+            'title': title,
+            'link': link,
+            'time': 'Recent',  # 暂时不过滤时间，先获取数据
+            'source': 'Yahoo Finance',
+            'content': '',  # 稍后填充
+            'full_time': ''  # 稍后填充准确时间
+        })
+        return True
+
     def parse_html_content(self, html_content, max_hours=2):
-        """解析HTML内容，提取新闻数据"""
+        """解析HTML内容，提取新闻数据 - 正则快速路径优先，DOM解析器兜底"""
         print("解析HTML内容...")
-        
+
         try:
-            soup = BeautifulSoup(html_content, 'lxml')
-            
-            # 调试：查看页面中有哪些相关的CSS类
+            # 快速路径：列表页只需要(aria-label, href)对，滚动后的页面有数MB，
+            # 字节级正则直接扫出链接，不必为这点信息构建整棵DOM树。
+            # 命中太少时说明页面结构有变，退回DOM解析器兜底
+            matches = _LISTING_ANCHOR_RE.findall(html_content.encode('utf-8', 'ignore'))
+            if len(matches) >= 10:
+                print(f"正则快速路径命中 {len(matches)} 个带aria-label的链接")
+                found_count = 0
+                for raw_title, raw_link in matches:
+                    title = unescape(raw_title.decode('utf-8', 'ignore'))
+                    link = unescape(raw_link.decode('utf-8', 'ignore'))
+                    if self._append_listing_article(title, link):
+                        found_count += 1
+                        print(f"[{found_count:2}] {title[:60]}... (Recent)")
+
+                print(f"\n成功解析 {len(self.articles)} 篇最近{max_hours}小时的新闻")
+                return self.articles
+
+            if HTMLParser is not None:
+                try:
+                    return self._parse_listing_selectolax(html_content, max_hours)
+                except Exception as e:
+                    print(f"⚠️ selectolax解析失败，退回BeautifulSoup: {e}")
+
+            return self._parse_listing_bs4(html_content, max_hours)
+
+        except Exception as e:
+            print(f"HTML解析出错: {e}")
+            return []
+
+    def _parse_listing_selectolax(self, html_content, max_hours=2):
+        """selectolax实现的列表页解析"""
+        tree = HTMLParser(html_content)
+
+        # 方法1：严格匹配（排除广告）
+        story_items = tree.css('li.stream-item.story-item:not(.ad-item)')
+        print(f"严格匹配找到 {len(story_items)} 个story-item")
+
+        if not story_items:
+            # 方法2：宽松匹配
+            story_items = tree.css('li[class*="item"]:not([class*="ad"])')
+            print(f"宽松匹配找到 {len(story_items)} 个item（非广告）")
+
+        if not story_items:
+            # 方法3：最宽松匹配 - 查找任何包含链接的li
+            story_items = [item for item in tree.css('li') if item.css_first('a[href]')]
+            print(f"最宽松匹配找到 {len(story_items)} 个包含链接的li元素")
+
+        found_count = 0
+        for item in story_items:
+            try:
+                # 从a标签的aria-label属性获取标题，备用任何有href的a标签
+                title_link = item.css_first('a[aria-label]') or item.css_first('a[href]')
+                if title_link is None:
+                    continue
+
+                # 提取标题 - 优先使用aria-label
+                title = title_link.attributes.get('aria-label') or title_link.text(strip=True)
+                link = title_link.attributes.get('href')
+
+                if self._append_listing_article(title, link):
+                    found_count += 1
+                    print(f"[{found_count:2}] {title[:60]}... (Recent)")
+
+            except Exception as e:
+                print(f"解析单个新闻项出错: {e}")
+                continue
+
+        print(f"\n成功解析 {len(self.articles)} 篇最近{max_hours}小时的新闻")
+        return self.articles
+
+    def _parse_listing_bs4(self, html_content, max_hours=2):
+        """BeautifulSoup实现的列表页解析（selectolax不可用时的备用路径）"""
+        soup = BeautifulSoup(html_content, 'lxml')
+
+        if self._debug:
+            # 调试：查看页面中有哪些相关的CSS类（整页DOM遍历，只在调试时做）
             all_lis = soup.find_all('li')
             print(f"页面中总共有 {len(all_lis)} 个li元素")
-            
+
             # 查找包含"stream"或"item"的li元素
-            stream_items = soup.find_all('li', class_=lambda x: x and ('stream' in str(x) or 'item' in str(x)))
+            stream_items = soup.find_all('li', class_=_STREAM_ITEM_RE)
             print(f"找到 {len(stream_items)} 个包含stream或item的li元素")
-            
+
             # 显示前几个和最后几个的class名称
             for i, item in enumerate(stream_items[:3]):
                 classes = item.get('class')
                 print(f"  开始li元素 {i+1}: class='{classes}'")
-            
+
             if len(stream_items) > 6:
                 print("  ...")
                 for i, item in enumerate(stream_items[-3:], len(stream_items)-2):
                     classes = item.get('class')
                     print(f"  结尾li元素 {i}: class='{classes}'")
-            
-            # 查找所有新闻项目（排除广告） - 使用更宽松的匹配
-            story_items = []
-            
-            # 方法1：严格匹配
-            story_items_strict = soup.find_all('li', class_=lambda x: x and 'stream-item' in str(x) and 'story-item' in str(x) and 'ad-item' not in str(x))
-            print(f"严格匹配找到 {len(story_items_strict)} 个story-item")
-            
-            # 方法2：宽松匹配
-            story_items_loose = soup.find_all('li', class_=lambda x: x and 'item' in str(x) and 'ad' not in str(x))
-            print(f"宽松匹配找到 {len(story_items_loose)} 个item（非广告）")
-            
-            # 使用有结果的方法
-            if len(story_items_strict) > 0:
-                story_items = story_items_strict
-                print("使用严格匹配结果")
-            elif len(story_items_loose) > 0:
-                story_items = story_items_loose
-                print("使用宽松匹配结果")
-            else:
-                # 方法3：最宽松匹配 - 查找任何包含链接的li
-                story_items = [item for item in all_lis if item.find('a', href=True)]
-                print(f"最宽松匹配找到 {len(story_items)} 个包含链接的li元素")
-            
-            found_count = 0
-            for item in story_items:  # 处理所有story_items
-                try:
-                    # 从a标签的aria-label属性获取标题
-                    title_link = item.find('a', {'aria-label': True})
+
+        # 查找所有新闻项目（排除广告） - 使用更宽松的匹配
+        story_items = []
+
+        # 方法1：严格匹配
+        story_items_strict = soup.find_all('li', class_=_is_strict_story_class)
+        print(f"严格匹配找到 {len(story_items_strict)} 个story-item")
+
+        # 方法2：宽松匹配
+        story_items_loose = soup.find_all('li', class_=_is_loose_item_class)
+        print(f"宽松匹配找到 {len(story_items_loose)} 个item（非广告）")
+
+        # 使用有结果的方法
+        if len(story_items_strict) > 0:
+            story_items = story_items_strict
+            print("使用严格匹配结果")
+        elif len(story_items_loose) > 0:
+            story_items = story_items_loose
+            print("使用宽松匹配结果")
+        else:
+            # 方法3：最宽松匹配 - 惰性求值，只在前两种都落空时才全页扫描
+            story_items = soup.select('li:has(a[href])')
+            print(f"最宽松匹配找到 {len(story_items)} 个包含链接的li元素")
+
+        found_count = 0
+        for item in story_items:  # 处理所有story_items
+            try:
+                # 从a标签的aria-label属性获取标题
+                title_link = item.find('a', {'aria-label': True})
+                if not title_link:
+                    # 备用：查找任何有href的a标签
+                    title_link = item.find('a', href=True)
                     if not title_link:
-                        # 备用：查找任何有href的a标签
-                        title_link = item.find('a', href=True)
-                        if not title_link:
-                            continue
-                    
-                    # 提取标题 - 优先使用aria-label
-                    title = title_link.get('aria-label')
-                    if not title:
-                        title = title_link.get_text(strip=True)
-                    
-                    if not title or len(title) < 10:
-                        continue
-                    
-                    # 提取链接
-                    link = title_link.get('href')
-                    if not link:
-                        continue
-                        
-                    # 处理相对链接
-                    if link.startswith('/'):
-                        link = f"https://finance.yahoo.com{link}"
-                    elif not link.startswith('http'):
                         continue
-                    
-                    # 暂时不过滤时间，先获取数据
-                    time_text = 'Recent'
-                    
-                    # 去重检查 - 基于title和link
-                    if any(existing['link'] == link or existing['title'] == title for existing in self.articles):
-                        continue
-                    
-                    article = {
-                        'title': title,
-                        'link': link, 
-                        'time': time_text,
-                        'source': 'Yahoo Finance',
-                        'content': '',  # 稍后填充
-                        'full_time': ''  # 稍后填充准确时间
-                    }
-                    
-                    self.articles.append(article)
+
+                # 提取标题 - 优先使用aria-label
+                title = title_link.get('aria-label')
+                if not title:
+                    title = title_link.get_text(strip=True)
+
+                if self._append_listing_article(title, title_link.get('href')):
                     found_count += 1
-                    print(f"[{found_count:2}] {title[:60]}... ({time_text})")
-                    
-                except Exception as e:
-                    print(f"解析单个新闻项出错: {e}")
-                    continue
-            
-            print(f"\n成功解析 {len(self.articles)} 篇最近{max_hours}小时的新闻")
-            return self.articles
-            
-        except Exception as e:
-            print(f"HTML解析出错: {e}")
-            return []
+                    print(f"[{found_count:2}] {title[:60]}... (Recent)")
+
+            except Exception as e:
+                print(f"解析单个新闻项出错: {e}")
+                continue
+
+        print(f"\n成功解析 {len(self.articles)} 篇最近{max_hours}小时的新闻")
+        return self.articles
     
-    async def crawl_single_url(self, url, max_hours=2):
-        """爬取单个URL"""
+    def _build_browser_config(self):
+        """构建浏览器配置 - 针对CI环境优化"""
+        return BrowserConfig(
+            browser_type="chromium",
+            headless=True,
+            verbose=False,  # CI环境中减少日志
+            extra_args=[
+                "--no-sandbox",  # CI环境必需
+                "--disable-dev-shm-usage",  # 避免内存问题
+                "--disable-gpu",  # 禁用GPU
+                "--disable-web-security",  # 禁用Web安全限制
+                "--disable-features=VizDisplayCompositor"  # 减少资源使用
+            ] if self.is_ci_environment else []
+        )
+
+    # 自适应滚动：新闻条目数连续2次不再增长就停止，最多20次
+    # 比固定的"15次×1.5秒"省时（列表早加载完就提前结束），慢页面上限也更高
+    _ADAPTIVE_SCROLL_JS = """
+    (async () => {
+        const sleep = (ms) => new Promise((resolve) => setTimeout(resolve, ms));
+        let lastCount = -1;
+        let stableRounds = 0;
+        for (let i = 0; i < 20; i++) {
+            window.scrollBy(0, window.innerHeight);
+            await sleep(800);
+            const count = document.querySelectorAll('li.stream-item').length;
+            if (count > lastCount) {
+                lastCount = count;
+                stableRounds = 0;
+            } else if (++stableRounds >= 2) {
+                break;
+            }
+        }
+    })();
+    """
+
+    def _build_crawl_config(self):
+        """构建单页爬取配置（自适应滚动）"""
+        # 配置爬取参数 - 不等待DOM，滚动脚本结束后直接获取内容
+        return CrawlerRunConfig(
+            cache_mode=CacheMode.BYPASS,
+            page_timeout=45000,  # 45秒超时
+            wait_for=None,  # 不等待特定事件
+            js_code=self._ADAPTIVE_SCROLL_JS
+        )
+
+    def _cached_listing_html(self, url):
+        """取未过期的列表页HTML缓存，没有则返回None"""
+        cached = self._listing_html_cache.get(url)
+        if cached and time.time() - cached[0] < _LISTING_CACHE_TTL:
+            return cached[1]
+        return None
+
+    async def crawl_single_url(self, crawler, url, max_hours=2):
+        """爬取单个URL（复用调用方传入的共享AsyncWebCrawler实例）"""
         print(f"爬取URL: {url}")
-        
-        
+
         try:
-            # 配置浏览器 - 针对CI环境优化
-            browser_config = BrowserConfig(
-                browser_type="chromium", 
-                headless=True,
-                verbose=False,  # CI环境中减少日志
-                extra_args=[
-                    "--no-sandbox",  # CI环境必需
-                    "--disable-dev-shm-usage",  # 避免内存问题
-                    "--disable-gpu",  # 禁用GPU
-                    "--disable-web-security",  # 禁用Web安全限制
-                    "--disable-features=VizDisplayCompositor"  # 减少资源使用
-                ] if self.is_ci_environment else []
-            )
-            
-            # 配置虚拟滚动 - 使用html容器，15次滚动
-            virtual_scroll_config = VirtualScrollConfig(
-                container_selector="html",  # html容器最稳定
-                scroll_count=15,  # 减少到15次滚动
-                scroll_by="page_height",  # 按页面高度滚动
-                wait_after_scroll=1.5  # 等待1.5秒
-            )
-            
-            # 配置爬取参数 - 不等待DOM，直接获取内容
-            crawl_config = CrawlerRunConfig(
-                cache_mode=CacheMode.BYPASS,
-                page_timeout=45000,  # 45秒超时
-                wait_for=None,  # 不等待特定事件，滚动完成后直接获取内容
-                virtual_scroll_config=virtual_scroll_config
+            result = await crawler.arun(
+                url=url,
+                config=self._build_crawl_config()
             )
-            
-            # 创建爬虫
-            async with AsyncWebCrawler(config=browser_config) as crawler:
-                result = await crawler.arun(
-                    url=url,
-                    config=crawl_config
-                )
-                
-                if result.success:
-                    print(f"✅ {url} - Crawl4AI爬取成功")
-                    print(f"页面内容长度: {len(result.html)} 字符")
-                    
-                    # 解析HTML内容
-                    articles = self.parse_html_content(result.html, max_hours)
-                    return articles
-                else:
-                    print(f"❌ {url} - Crawl4AI爬取失败: {result.error_message}")
-                    return []
-                    
+
+            if result.success:
+                print(f"✅ {url} - Crawl4AI爬取成功")
+                print(f"页面内容长度: {len(result.html)} 字符")
+
+                # 缓存原始HTML - 回退重试可以只重新解析，不必重新抓取
+                self._listing_html_cache[url] = (time.time(), result.html)
+
+                # 解析HTML内容
+                articles = self.parse_html_content(result.html, max_hours)
+                return articles
+            else:
+                print(f"❌ {url} - Crawl4AI爬取失败: {result.error_message}")
+                return []
+
         except Exception as e:
             print(f"❌ {url} - Crawl4AI爬取出错: {e}")
             return []
@@ -399,12 +749,29 @@ class YahooNewsCrawl4AICrawler:
         print("使用Crawl4AI虚拟滚动爬取多个URL...")
         
         # 阶段1: 获取所有URL的基础文章列表（title, link, time）
+        # 共享一个浏览器实例，3个URL并发爬取：浏览器冷启动只付一次，
+        # 各页面的滚动等待时间相互重叠
         print("\n=== 阶段1: 获取文章列表 ===")
         all_articles = []
-        
-        for url in self.urls:
+        results = []
+
+        try:
+            async with self._browser_sem:
+                crawler = await self._get_crawler()
+                results = await asyncio.gather(
+                    *[self.crawl_single_url(crawler, url, max_hours) for url in self.urls],
+                    return_exceptions=True
+                )
+        except Exception as e:
+            print(f"❌ Crawl4AI浏览器启动失败: {e}")
+            results = [[] for _ in self.urls]
+
+        for url, articles in zip(self.urls, results):
             try:
-                articles = await self.crawl_single_url(url, max_hours)
+                if isinstance(articles, Exception):
+                    print(f"处理URL {url} 时出错: {articles}")
+                    continue
+
                 if articles:
                     print(f"从 {url} 获取到 {len(articles)} 篇新闻")
                     all_articles.extend(articles)
@@ -414,31 +781,43 @@ class YahooNewsCrawl4AICrawler:
                     if fallback_articles:
                         print(f"备用方法从 {url} 获取到 {len(fallback_articles)} 篇新闻")
                         all_articles.extend(fallback_articles)
-                        
+
             except Exception as e:
                 print(f"处理URL {url} 时出错: {e}")
                 continue
         
-        # 内部去重（基于title和link）
+        # 内部去重（基于title和link）- 重建集合索引，O(1)成员检查
         self.articles = []
+        self._seen_links = set()
+        self._seen_titles = set()
         for article in all_articles:
-            if not any(existing['link'] == article['link'] or existing['title'] == article['title'] for existing in self.articles):
-                self.articles.append(article)
+            if article['link'] in self._seen_links or article['title'] in self._seen_titles:
+                continue
+            self._seen_links.add(article['link'])
+            self._seen_titles.add(article['title'])
+            self.articles.append(article)
         
         print(f"\n从所有URL获取 {len(all_articles)} 篇新闻，内部去重后保留 {len(self.articles)} 篇")
-        
+
+        # 空结果直接返回，跳过数据库查重和内容获取
+        if not self.articles:
+            print("⚠️ 未获取到任何文章，跳过后续处理")
+            return self.articles
+
         # 阶段2: Supabase查重检查
         print("\n=== 阶段2: 数据库查重检查 ===")
         new_articles = self.articles  # 默认都是新文章
         
         if self.supabase_manager and self.supabase_manager.is_connected():
             try:
-                # 获取数据库中现有的URL和Title
-                existing_urls, existing_titles = self.supabase_manager.get_existing_articles()
-                
+                # 只查询本次候选文章对应的URL和Title，避免拉取全表
+                candidate_urls = [article['link'] for article in self.articles]
+                candidate_titles = [article['title'] for article in self.articles]
+                existing_urls, existing_titles = self.supabase_manager.find_existing_keys(candidate_urls, candidate_titles)
+
                 # 进行查重检查
                 new_articles = self.supabase_manager.check_duplicates(self.articles, existing_urls, existing_titles)
-                
+
             except Exception as e:
                 print(f"⚠️ 数据库查重失败，将处理所有文章: {e}")
                 new_articles = self.articles
@@ -458,9 +837,8 @@ class YahooNewsCrawl4AICrawler:
         if max_articles and len(new_articles) > max_articles:
             print(f"📝 限制处理文章数量: {max_articles} 篇（总共有 {len(new_articles)} 篇新文章）")
         
-        # 获取详细内容 - 降低并发数以减少被检测的风险
-        concurrent_limit = 3 if self.is_ci_environment else 5
-        await self.fetch_articles_content_for_articles(articles_to_process, max_concurrent=concurrent_limit)
+        # 获取详细内容 - 并发数由__init__中的实例级信号量统一控制
+        await self.fetch_articles_content_for_articles(articles_to_process)
         
         # 阶段4: 保存到数据库
         if self.supabase_manager and self.supabase_manager.is_connected():
@@ -470,7 +848,7 @@ class YahooNewsCrawl4AICrawler:
                 articles_with_content = [article for article in articles_to_process if article.get('content', '').strip()]
                 
                 if articles_with_content:
-                    success = self.supabase_manager.insert_articles(articles_with_content)
+                    success = await self.supabase_manager.insert_articles(articles_with_content)
                     if success:
                         print(f"✅ 成功将 {len(articles_with_content)} 篇文章保存到数据库")
                     else:
@@ -486,54 +864,44 @@ class YahooNewsCrawl4AICrawler:
         
         return self.articles
     
-    async def fetch_articles_content_for_articles(self, articles, max_concurrent=5):
-        """批量并发获取指定文章列表的详细内容和时间"""
+    async def fetch_articles_content_for_articles(self, articles):
+        """批量并发获取指定文章列表的详细内容和时间（并发数由实例级信号量控制）"""
         if not articles:
             return
-        
+
         total_articles = len(articles)
-        print(f"\n开始并发获取 {total_articles} 篇文章的详细内容（{max_concurrent}并发）...")
-        
-        # 创建信号量控制并发数量
-        semaphore = Semaphore(max_concurrent)
-        
+        print(f"\n开始并发获取 {total_articles} 篇文章的详细内容...")
+
         # 创建任务列表
         tasks = []
         for i, article in enumerate(articles):
-            task = self.fetch_single_article_content(semaphore, i+1, total_articles, article)
+            task = self.fetch_single_article_content(i+1, total_articles, article)
             tasks.append(task)
-        
+
         # 并发执行所有任务
         await asyncio.gather(*tasks, return_exceptions=True)
-        
+
         print(f"\n文章内容获取完成!")
-    
-    async def fetch_articles_content(self, max_articles=None, max_concurrent=5):
+
+    async def fetch_articles_content(self, max_articles=None):
         """批量并发获取文章的详细内容和时间（兼容旧接口）"""
         if not self.articles:
             return
-        
+
         # 限制文章数量以避免过长时间
         articles_to_process = self.articles[:max_articles] if max_articles else self.articles
-        await self.fetch_articles_content_for_articles(articles_to_process, max_concurrent)
-    
-    async def fetch_single_article_content(self, semaphore, index, total, article):
+        await self.fetch_articles_content_for_articles(articles_to_process)
+
+    async def fetch_single_article_content(self, index, total, article):
         """获取单篇文章内容（带并发控制）"""
-        async with semaphore:  # 限制并发数量
+        async with self._fetch_sem:  # 限制进程内总并发数量
             try:
                 print(f"[{index:2}/{total}] 获取内容: {article['title'][:50]}...")
-                
-                # 添加总体超时保护 - requests比Crawl4AI快，缩短超时时间
-                timeout_limit = 20.0 if self.is_ci_environment else 15.0
-                try:
-                    details = await asyncio.wait_for(
-                        self.get_article_content(article['link']),
-                        timeout=timeout_limit
-                    )
-                except asyncio.TimeoutError:
-                    print(f"    ⚠️ [{index:2}] 获取超时，跳过")
-                    details = {"content": "", "full_time": ""}
-                
+
+                # 超时由requests的timeout参数兜底，不再用asyncio.wait_for双重包装
+                # （wait_for超时后线程里的请求仍会继续跑，白占线程池）
+                details = await self.get_article_content(article['link'])
+
                 # 更新文章信息
                 article['content'] = details['content']
                 article['full_time'] = details['full_time']
@@ -553,19 +921,27 @@ class YahooNewsCrawl4AICrawler:
     async def crawl_single_url_fallback(self, url, max_hours=2):
         """单URL备用爬取方法（使用requests + 反反爬虫）"""
         print(f"备用方法爬取: {url}")
-        
+
         try:
+            # 5分钟内刚抓过这个列表页的话直接重新解析缓存的HTML，
+            # 不再对同一URL重复发起请求
+            cached_html = self._cached_listing_html(url)
+            if cached_html is not None:
+                print(f"♻️ {url} - 复用缓存的页面内容（{len(cached_html)} 字符）")
+                return self.parse_html_content(cached_html, max_hours)
+
             # 添加随机延迟
             await AntiDetection.random_delay(1.0, 3.0)
-            
-            # 使用随机请求头
-            headers = AntiDetection.get_random_headers()
-            
+
+            # 基础请求头已设置在会话上，每次只随机化User-Agent
+            headers = {'User-Agent': random.choice(AntiDetection.USER_AGENTS)}
+
             timeout = 20 if self.is_ci_environment else 15
-            response = requests.get(url, headers=headers, timeout=timeout)
+            response = await asyncio.to_thread(self.session.get, url, headers=headers, timeout=timeout)
             response.raise_for_status()
-            
+
             print(f"✅ {url} - 备用方法：页面内容长度 {len(response.text)} 字符")
+            self._listing_html_cache[url] = (time.time(), response.text)
             articles = self.parse_html_content(response.text, max_hours)
             return articles
             
@@ -577,36 +953,50 @@ class YahooNewsCrawl4AICrawler:
         """备用爬取方法（不使用Crawl4AI）- 爬取所有URL，集成Supabase流程"""
         print("使用备用方法爬取所有URL...")
         
-        # 阶段1: 获取文章列表
+        # 阶段1: 获取文章列表 - 3个URL并发请求
         print("\n=== 阶段1: 获取文章列表（备用方法）===")
         all_articles = []
-        
-        for url in self.urls:
-            try:
-                articles = await self.crawl_single_url_fallback(url, max_hours)
-                if articles:
-                    print(f"备用方法从 {url} 获取到 {len(articles)} 篇新闻")
-                    all_articles.extend(articles)
-                    
-            except Exception as e:
-                print(f"备用方法处理URL {url} 时出错: {e}")
+
+        results = await asyncio.gather(
+            *[self.crawl_single_url_fallback(url, max_hours) for url in self.urls],
+            return_exceptions=True
+        )
+
+        for url, articles in zip(self.urls, results):
+            if isinstance(articles, Exception):
+                print(f"备用方法处理URL {url} 时出错: {articles}")
                 continue
+            if articles:
+                print(f"备用方法从 {url} 获取到 {len(articles)} 篇新闻")
+                all_articles.extend(articles)
         
-        # 内部去重
+        # 内部去重 - 重建集合索引，O(1)成员检查
         self.articles = []
+        self._seen_links = set()
+        self._seen_titles = set()
         for article in all_articles:
-            if not any(existing['link'] == article['link'] or existing['title'] == article['title'] for existing in self.articles):
-                self.articles.append(article)
+            if article['link'] in self._seen_links or article['title'] in self._seen_titles:
+                continue
+            self._seen_links.add(article['link'])
+            self._seen_titles.add(article['title'])
+            self.articles.append(article)
         
         print(f"\n备用方法获取 {len(all_articles)} 篇新闻，内部去重后保留 {len(self.articles)} 篇")
-        
+
+        # 空结果直接返回，跳过数据库查重和内容获取
+        if not self.articles:
+            print("⚠️ 未获取到任何文章，跳过后续处理")
+            return self.articles
+
         # 阶段2: Supabase查重检查
         print("\n=== 阶段2: 数据库查重检查 ===")
         new_articles = self.articles
         
         if self.supabase_manager and self.supabase_manager.is_connected():
             try:
-                existing_urls, existing_titles = self.supabase_manager.get_existing_articles()
+                candidate_urls = [article['link'] for article in self.articles]
+                candidate_titles = [article['title'] for article in self.articles]
+                existing_urls, existing_titles = self.supabase_manager.find_existing_keys(candidate_urls, candidate_titles)
                 new_articles = self.supabase_manager.check_duplicates(self.articles, existing_urls, existing_titles)
             except Exception as e:
                 print(f"⚠️ 数据库查重失败，将处理所有文章: {e}")
@@ -624,9 +1014,8 @@ class YahooNewsCrawl4AICrawler:
         if max_articles and len(new_articles) > max_articles:
             print(f"📝 限制处理文章数量: {max_articles} 篇（总共有 {len(new_articles)} 篇新文章）")
         
-        # 获取详细内容 - 降低并发数以减少被检测的风险
-        concurrent_limit = 3 if self.is_ci_environment else 5
-        await self.fetch_articles_content_for_articles(articles_to_process, max_concurrent=concurrent_limit)
+        # 获取详细内容 - 并发数由__init__中的实例级信号量统一控制
+        await self.fetch_articles_content_for_articles(articles_to_process)
         
         # 阶段4: 保存到数据库
         if self.supabase_manager and self.supabase_manager.is_connected():
@@ -634,7 +1023,7 @@ class YahooNewsCrawl4AICrawler:
             try:
                 articles_with_content = [article for article in articles_to_process if article.get('content', '').strip()]
                 if articles_with_content:
-                    success = self.supabase_manager.insert_articles(articles_with_content)
+                    success = await self.supabase_manager.insert_articles(articles_with_content)
                     if success:
                         print(f"✅ 成功将 {len(articles_with_content)} 篇文章保存到数据库")
             except Exception as e:
@@ -653,9 +1042,14 @@ class YahooNewsCrawl4AICrawler:
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             filename = f"yahoo_multi_news_{timestamp}.json"
         
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(self.articles, f, ensure_ascii=False, indent=2)
-        
+        if orjson is not None:
+            with open(filename, 'wb') as f:
+                f.write(orjson.dumps(self.articles, option=orjson.OPT_INDENT_2))
+        else:
+            # 标准库退路：紧凑输出，indent会成倍增加编码耗时
+            with open(filename, 'w', encoding='utf-8') as f:
+                json.dump(self.articles, f, ensure_ascii=False, separators=(',', ':'))
+
         print(f"JSON已保存: {filename}")
         return filename
     
@@ -668,7 +1062,8 @@ class YahooNewsCrawl4AICrawler:
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             filename = f"yahoo_multi_news_{timestamp}.csv"
         
-        with open(filename, 'w', newline='', encoding='utf-8') as f:
+        # 1MB写缓冲：多KB的content字段逐行写出时减少系统调用次数
+        with open(filename, 'w', newline='', encoding='utf-8', buffering=1 << 20) as f:
             fieldnames = ['title', 'link', 'time', 'source', 'content', 'full_time']
             writer = csv.DictWriter(f, fieldnames=fieldnames)
             writer.writeheader()
@@ -725,7 +1120,9 @@ async def main():
     supabase_config = {
         'url': os.getenv('SUPABASE_URL'),
         'anon_key': os.getenv('SUPABASE_ANON_KEY'),
-        'table_name': os.getenv('SUPABASE_TABLE_NAME', 'news_items')
+        'table_name': os.getenv('SUPABASE_TABLE_NAME', 'news_items'),
+        # 可选：PostgreSQL直连DSN，超大批次走COPY写入
+        'pg_dsn': os.getenv('SUPABASE_PG_DSN')
     }
     
     print(f"SUPABASE_URL: {supabase_config['url'] or '未设置'}")
@@ -758,27 +1155,38 @@ async def main():
         # 立即测试数据库查询
         print("\n=== 第3步: 数据库查询测试 ===")
         try:
-            existing_urls, existing_titles = test_manager.get_existing_articles()
-            print(f"✅ 数据库查询成功 - 现有文章: {len(existing_urls)} 个URL, {len(existing_titles)} 个标题")
+            # 用一个探针键做小查询验证表可读，避免启动时拉取全表
+            probe_urls, probe_titles = test_manager.find_existing_keys(
+                ['https://finance.yahoo.com/'], ['__connection_test__']
+            )
+            print(f"✅ 数据库查询成功 - 查重接口可用（命中 {len(probe_urls)} 个URL, {len(probe_titles)} 个标题）")
         except Exception as e:
             print(f"❌ 数据库查询测试失败: {e}")
             exit(1)
     
     # 创建爬虫（带Supabase配置）
     crawler = YahooNewsCrawl4AICrawler(supabase_config=supabase_config)
-    
+
+    try:
+        await run_crawler(crawler, is_github_actions)
+    finally:
+        await crawler.aclose()
+
+
+async def run_crawler(crawler, is_github_actions):
+    """执行爬取流程"""
     max_hours = int(os.getenv('INPUT_MAX_HOURS', '2'))  # 支持工作流参数
     print(f"\n爬取时间范围: 最近{max_hours}小时")
-    
+
     # 尝试使用Crawl4AI爬取（生产环境无文章数量限制）
     print("尝试使用Crawl4AI爬取...")
     articles = await crawler.crawl_with_crawl4ai(max_hours=max_hours)
-    
+
     # 如果Crawl4AI失败，使用备用方法
     if not articles:
         print("\nCrawl4AI爬取失败，尝试备用方法...")
         articles = await crawler.crawl_fallback(max_hours=max_hours)
-    
+
     if articles:
         # 显示结果
         crawler.show_summary()